@@ -11,6 +11,7 @@ PORT = 8080       # Порт по умолчанию
 # Настройки сервера
 MAX_CONNECTIONS = 10        # Максимальное количество одновременных подключений
 REQUEST_TIMEOUT = 30        # Таймаут запроса в секундах
+IDLE_TIMEOUT = 0            # Завершение после простоя в секундах (0 - не завершать)
 CACHE_STATIC_FILES = True   # Кешировать статические файлы
 CACHE_TIME = 3600          # Время кеширования в секундах (1 час)
 
@@ -56,6 +57,7 @@ def get_config():
         'port': PORT,
         'max_connections': MAX_CONNECTIONS,
         'request_timeout': REQUEST_TIMEOUT,
+        'idle_timeout': IDLE_TIMEOUT,
         'cache_static_files': CACHE_STATIC_FILES,
         'cache_time': CACHE_TIME,
         'enable_monitoring': ENABLE_MONITORING,
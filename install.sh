@@ -10,6 +10,8 @@ SERVICE_NAME="home-menu"
 INSTALL_DIR="/opt/home-menu"
 SERVICE_PORT=8080
 SERVICE_USER="nobody"
+IDLE_TIMEOUT=300  # Секунд без запросов до выхода сервера при сокет-активации
+INETD_CONF="/etc/inetd.conf"
 
 # Цвета для вывода
 RED='\033[0;31m'
@@ -105,27 +107,38 @@ install_files() {
 create_systemd_service() {
     print_info "Создание systemd сервиса..."
     
+    # Порт слушает systemd, сервер запускается при первом подключении
+    # и завершается после простоя, не занимая память между обращениями
+    cat << EOF > /etc/systemd/system/${SERVICE_NAME}.socket
+[Unit]
+Description=Home Menu Server Socket
+
+[Socket]
+ListenStream=$SERVICE_PORT
+
+[Install]
+WantedBy=sockets.target
+EOF
+
     cat << EOF > /etc/systemd/system/${SERVICE_NAME}.service
 [Unit]
 Description=Home Menu Server
-After=network.target
+Requires=${SERVICE_NAME}.socket
+After=network.target ${SERVICE_NAME}.socket
 
 [Service]
 Type=simple
 User=$SERVICE_USER
 WorkingDirectory=$INSTALL_DIR
-ExecStart=/usr/bin/python3 $INSTALL_DIR/server.py -p $SERVICE_PORT --monitor
-Restart=always
+ExecStart=/usr/bin/python3 $INSTALL_DIR/server.py -p $SERVICE_PORT --monitor --idle-timeout $IDLE_TIMEOUT
+Restart=on-failure
 RestartSec=5
 StandardOutput=journal
 StandardError=journal
-
-[Install]
-WantedBy=multi-user.target
 EOF
 
     systemctl daemon-reload 2>/dev/null || true
-    print_success "Systemd сервис создан"
+    print_success "Systemd сервис создан (запуск по подключению)"
 }
 
 create_openwrt_service() {
@@ -165,6 +178,36 @@ EOF
     print_success "OpenWrt init скрипт создан"
 }
 
+reload_inetd() {
+    if [ -x /etc/init.d/inetd ]; then
+        /etc/init.d/inetd enable
+        /etc/init.d/inetd restart
+    elif pidof inetd >/dev/null 2>&1; then
+        killall -HUP inetd
+    else
+        inetd
+    fi
+}
+
+create_inetd_service() {
+    print_info "Создание записи inetd..."
+    
+    # Постоянно запущенный init.d сервис от прошлой установки занял бы порт
+    if [ -f /etc/init.d/${SERVICE_NAME} ]; then
+        /etc/init.d/${SERVICE_NAME} stop 2>/dev/null || true
+        /etc/init.d/${SERVICE_NAME} disable 2>/dev/null || true
+        rm -f /etc/init.d/${SERVICE_NAME}
+    fi
+    
+    # Порт слушает inetd, сервер запускается при первом подключении
+    # и завершается после простоя, не занимая память между обращениями
+    touch "$INETD_CONF"
+    sed -i "\#$INSTALL_DIR/server.py#d" "$INETD_CONF"
+    echo "$SERVICE_PORT stream tcp wait $SERVICE_USER /usr/bin/python3 python3 $INSTALL_DIR/server.py --idle-timeout $IDLE_TIMEOUT" >> "$INETD_CONF"
+    
+    print_success "Запись inetd создана (запуск по подключению)"
+}
+
 configure_firewall() {
     print_info "Настройка брандмауэра..."
     
@@ -193,15 +236,22 @@ start_service() {
     
     # Systemd
     if command -v systemctl &> /dev/null; then
-        systemctl enable ${SERVICE_NAME} 2>/dev/null || true
-        systemctl start ${SERVICE_NAME} 2>/dev/null || true
+        # Сервис от прошлой установки запускался при загрузке и занимал порт
+        systemctl stop ${SERVICE_NAME} 2>/dev/null || true
+        systemctl disable ${SERVICE_NAME} 2>/dev/null || true
+        systemctl enable ${SERVICE_NAME}.socket 2>/dev/null || true
+        systemctl start ${SERVICE_NAME}.socket 2>/dev/null || true
         sleep 2
-        if systemctl is-active --quiet ${SERVICE_NAME} 2>/dev/null; then
-            print_success "Сервис запущен через systemd"
+        if systemctl is-active --quiet ${SERVICE_NAME}.socket 2>/dev/null; then
+            print_success "Сокет сервиса запущен через systemd"
         else
             print_error "Ошибка запуска через systemd"
-            systemctl status ${SERVICE_NAME} 2>/dev/null || true
+            systemctl status ${SERVICE_NAME}.socket 2>/dev/null || true
         fi
+    # inetd
+    elif grep -q "$INSTALL_DIR/server.py" "$INETD_CONF" 2>/dev/null; then
+        reload_inetd
+        print_success "Сервис подключен к inetd"
     # OpenWrt
     elif [ -f /etc/init.d/${SERVICE_NAME} ]; then
         /etc/init.d/${SERVICE_NAME} enable
@@ -223,10 +273,14 @@ show_completion_info() {
     echo
     print_info "🔧 Управление сервисом:"
     if command -v systemctl &> /dev/null; then
-        print_info "   • Статус: sudo systemctl status $SERVICE_NAME"
-        print_info "   • Остановка: sudo systemctl stop $SERVICE_NAME"
+        print_info "   • Статус: sudo systemctl status $SERVICE_NAME.socket $SERVICE_NAME"
+        print_info "   • Остановка: sudo systemctl stop $SERVICE_NAME.socket $SERVICE_NAME"
         print_info "   • Перезапуск: sudo systemctl restart $SERVICE_NAME"
         print_info "   • Логи: sudo journalctl -u $SERVICE_NAME -f"
+    elif grep -q "$INSTALL_DIR/server.py" "$INETD_CONF" 2>/dev/null; then
+        print_info "   • Сервер запускается inetd при обращении"
+        print_info "   • Статус: ps | grep server.py"
+        print_info "   • Настройка: $INETD_CONF"
     else
         print_info "   • Статус: ps | grep server.py"
         print_info "   • Остановка: sudo /etc/init.d/$SERVICE_NAME stop"
@@ -256,7 +310,10 @@ main() {
     # Создаем соответствующий сервис
     if command -v systemctl &> /dev/null; then
         create_systemd_service
+    elif command -v inetd &> /dev/null; then
+        create_inetd_service
     else
+        print_warning "inetd не найден, сервер будет работать постоянно"
         create_openwrt_service
     fi
     
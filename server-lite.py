@@ -6,14 +6,23 @@
 
 import http.server
 import socketserver
+import socket
 import os
 import sys
 import signal
+import threading
 import time
 
 # Простая конфигурация без argparse
 HOST = "0.0.0.0"
 PORT = 8080
+IDLE_TIMEOUT = 0  # Секунд без запросов до завершения (0 - не завершать)
+
+# Первый дескриптор, который передает systemd при сокет-активации
+SD_LISTEN_FDS_START = 3
+
+# Таймаут подключения при завершении по простою
+REQUEST_TIMEOUT = 30
 
 class SimpleMenuHandler(http.server.SimpleHTTPRequestHandler):
     """Упрощенный обработчик для меню"""
@@ -54,15 +63,89 @@ class ThreadedServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     """Многопоточный сервер"""
     allow_reuse_address = True
     daemon_threads = True
+    
+    def __init__(self, *args, **kwargs):
+        self.active_requests = 0
+        self.last_activity = time.monotonic()
+        self.activity_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+    
+    def process_request(self, request, client_address):
+        """Учет запросов в обработке"""
+        with self.activity_lock:
+            self.active_requests += 1
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self.request_done()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.request_done()
+    
+    def request_done(self):
+        with self.activity_lock:
+            self.active_requests -= 1
+            self.last_activity = time.monotonic()
+    
+    def idle_time(self):
+        """Время простоя в секундах"""
+        with self.activity_lock:
+            if self.active_requests:
+                return 0
+            return time.monotonic() - self.last_activity
 
 def signal_handler(signum, frame):
     """Обработчик сигналов"""
     print("\n🛑 Сервер останавливается...")
     sys.exit(0)
 
+def is_listening_socket(fd):
+    """Проверка, что дескриптор - слушающий сокет"""
+    try:
+        sock = socket.socket(fileno=fd)
+    except OSError:
+        return False
+    try:
+        return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN) == 1
+    except OSError:
+        return False
+    finally:
+        sock.detach()
+
+def get_inherited_socket():
+    """Сокет от systemd (LISTEN_FDS) или inetd (stdin)"""
+    if (os.environ.get('LISTEN_PID') == str(os.getpid())
+            and os.environ.get('LISTEN_FDS', '0') != '0'):
+        fd = SD_LISTEN_FDS_START
+    elif is_listening_socket(0):
+        fd = 0
+        # inetd подставляет тот же сокет в stdout/stderr
+        if is_listening_socket(1):
+            sys.stdout = sys.stderr = open(os.devnull, 'w')
+    else:
+        return None
+    
+    for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+        os.environ.pop(name, None)
+    return socket.socket(fileno=fd)
+
+def create_server(inherited_socket=None):
+    """Создание сервера на своем или унаследованном сокете"""
+    if inherited_socket is None:
+        return ThreadedServer((HOST, PORT), SimpleMenuHandler)
+    
+    httpd = ThreadedServer((HOST, PORT), SimpleMenuHandler, bind_and_activate=False)
+    httpd.socket.close()
+    httpd.socket = inherited_socket
+    httpd.server_address = inherited_socket.getsockname()
+    return httpd
+
 def get_local_ip():
     """Простое получение IP"""
-    import socket
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
@@ -74,7 +157,7 @@ def get_local_ip():
 
 def parse_args():
     """Простой парсер аргументов без argparse"""
-    global HOST, PORT
+    global HOST, PORT, IDLE_TIMEOUT
     
     i = 1
     while i < len(sys.argv):
@@ -91,10 +174,19 @@ def parse_args():
             if i + 1 < len(sys.argv):
                 HOST = sys.argv[i + 1]
                 i += 1
+        elif arg == '--idle-timeout':
+            if i + 1 < len(sys.argv):
+                try:
+                    IDLE_TIMEOUT = int(sys.argv[i + 1])
+                    i += 1
+                except ValueError:
+                    print("❌ Неверный таймаут простоя!")
+                    sys.exit(1)
         elif arg in ['-h', '--help']:
-            print("Использование: python3 server-lite.py [-p PORT] [-H HOST]")
-            print("  -p, --port    Порт (по умолчанию: 8080)")
-            print("  -H, --host    IP адрес (по умолчанию: 0.0.0.0)")
+            print("Использование: python3 server-lite.py [-p PORT] [-H HOST] [--idle-timeout SEC]")
+            print("  -p, --port      Порт (по умолчанию: 8080)")
+            print("  -H, --host      IP адрес (по умолчанию: 0.0.0.0)")
+            print("  --idle-timeout  Завершить после SEC секунд без запросов (по умолчанию: 0 - не завершать)")
             sys.exit(0)
         i += 1
 
@@ -102,6 +194,9 @@ def main():
     # Парсим аргументы
     parse_args()
     
+    # Работаем из папки сервера: inetd и systemd запускают его из /
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    
     # Проверяем наличие файла
     if not os.path.exists('index.html'):
         print("❌ Файл index.html не найден!")
@@ -113,20 +208,42 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     try:
-        # Создаем сервер
-        with ThreadedServer((HOST, PORT), SimpleMenuHandler) as httpd:
-            local_ip = get_local_ip()
+        # Создаем сервер (при сокет-активации - на переданном сокете)
+        inherited_socket = get_inherited_socket()
+        with create_server(inherited_socket) as httpd:
+            host, port = httpd.server_address[:2]
             
-            print("🍽️  Сервер домашнего меню запущен!")
-            print(f"📍 Локальный адрес: http://{local_ip}:{PORT}")
-            print(f"🌐 Сетевой адрес: http://{HOST}:{PORT}")
-            print("⚡ Lite версия для OpenWrt")
-            print("🔄 Нажмите Ctrl+C для остановки")
-            print("-" * 40)
+            if inherited_socket is not None:
+                print(f"🍽️  Сервер домашнего меню активирован на {host}:{port}")
+            else:
+                local_ip = get_local_ip()
+                
+                print("🍽️  Сервер домашнего меню запущен!")
+                print(f"📍 Локальный адрес: http://{local_ip}:{port}")
+                print(f"🌐 Сетевой адрес: http://{host}:{port}")
+                print("⚡ Lite версия для OpenWrt")
+                print("🔄 Нажмите Ctrl+C для остановки")
+                print("-" * 40)
+            
+            # Завершение по простою
+            if IDLE_TIMEOUT > 0:
+                SimpleMenuHandler.timeout = REQUEST_TIMEOUT
+                
+                def idle_monitor():
+                    while httpd.idle_time() < IDLE_TIMEOUT:
+                        time.sleep(1)
+                    httpd.shutdown()
+                
+                threading.Thread(target=idle_monitor, daemon=True).start()
             
             # Запускаем сервер
             httpd.serve_forever()
             
+            # Дожидаемся начатых запросов
+            while httpd.active_requests:
+                time.sleep(0.1)
+            print(f"💤 Нет запросов {IDLE_TIMEOUT} сек., сервер завершает работу")
+            
     except OSError as e:
         if e.errno == 98:
             print(f"❌ Порт {PORT} уже используется!")
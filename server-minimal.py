@@ -15,6 +15,13 @@ import time
 HOST = "0.0.0.0"
 PORT = 8080
 MAX_CONNECTIONS = 10
+IDLE_TIMEOUT = 0  # Секунд без запросов до завершения (0 - не завершать)
+
+# Первый дескриптор, который передает systemd при сокет-активации
+SD_LISTEN_FDS_START = 3
+
+# Таймаут подключения при завершении по простою
+REQUEST_TIMEOUT = 30
 
 def simple_url_decode(url):
     """Простое URL декодирование без urllib"""
@@ -37,35 +44,89 @@ def simple_url_decode(url):
     url = url.replace('%2F', '/')
     return url
 
+def is_listening_socket(fd):
+    """Проверка, что дескриптор - слушающий сокет"""
+    try:
+        sock = socket.socket(fileno=fd)
+    except OSError:
+        return False
+    try:
+        return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN) == 1
+    except OSError:
+        return False
+    finally:
+        sock.detach()
+
+def get_inherited_socket():
+    """Сокет от systemd (LISTEN_FDS) или inetd (stdin)"""
+    if (os.environ.get('LISTEN_PID') == str(os.getpid())
+            and os.environ.get('LISTEN_FDS', '0') != '0'):
+        fd = SD_LISTEN_FDS_START
+    elif is_listening_socket(0):
+        fd = 0
+        # inetd подставляет тот же сокет в stdout/stderr
+        if is_listening_socket(1):
+            sys.stdout = sys.stderr = open(os.devnull, 'w')
+    else:
+        return None
+    
+    for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+        os.environ.pop(name, None)
+    return socket.socket(fileno=fd)
+
 class MinimalHTTPServer:
-    def __init__(self, host, port):
+    def __init__(self, host, port, inherited_socket=None, idle_timeout=0):
         self.host = host
         self.port = port
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.inherited = inherited_socket is not None
+        if self.inherited:
+            self.socket = inherited_socket
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.idle_timeout = idle_timeout
+        self.active_requests = 0
+        self.last_activity = time.monotonic()
+        self.activity_lock = threading.Lock()
         self.running = True
         
     def start(self):
         """Запуск сервера"""
         try:
-            self.socket.bind((self.host, self.port))
-            self.socket.listen(MAX_CONNECTIONS)
-            print(f"🍽️  Минимальный сервер запущен на {self.host}:{self.port}")
-            print("🔄 Нажмите Ctrl+C для остановки")
+            if self.inherited:
+                host, port = self.socket.getsockname()[:2]
+                print(f"🍽️  Минимальный сервер активирован на {host}:{port}")
+            else:
+                self.socket.bind((self.host, self.port))
+                self.socket.listen(MAX_CONNECTIONS)
+                print(f"🍽️  Минимальный сервер запущен на {self.host}:{self.port}")
+                print("🔄 Нажмите Ctrl+C для остановки")
+            
+            # Периодически просыпаемся, чтобы проверить простой
+            if self.idle_timeout > 0:
+                self.socket.settimeout(1)
             
             while self.running:
                 try:
                     client_socket, address = self.socket.accept()
-                    client_thread = threading.Thread(
-                        target=self.handle_client, 
-                        args=(client_socket, address)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
+                except socket.timeout:
+                    if self.idle_time() >= self.idle_timeout:
+                        print(f"💤 Нет запросов {self.idle_timeout} сек., сервер завершает работу")
+                        break
+                    continue
                 except OSError:
                     if self.running:
                         print("❌ Ошибка принятия подключения")
                     break
+                
+                with self.activity_lock:
+                    self.active_requests += 1
+                client_thread = threading.Thread(
+                    target=self.handle_client, 
+                    args=(client_socket, address)
+                )
+                client_thread.daemon = True
+                client_thread.start()
                     
         except Exception as e:
             print(f"❌ Ошибка запуска сервера: {e}")
@@ -77,9 +138,20 @@ class MinimalHTTPServer:
         self.running = False
         self.socket.close()
     
+    def idle_time(self):
+        """Время простоя в секундах (0, если есть запросы в обработке)"""
+        with self.activity_lock:
+            if self.active_requests:
+                return 0
+            return time.monotonic() - self.last_activity
+    
     def handle_client(self, client_socket, address):
         """Обработка клиентского подключения"""
         try:
+            # Зависший клиент не должен мешать завершению по простою
+            if self.idle_timeout > 0:
+                client_socket.settimeout(REQUEST_TIMEOUT)
+            
             request = client_socket.recv(1024).decode('utf-8')
             if not request:
                 return
@@ -108,6 +180,9 @@ class MinimalHTTPServer:
             print(f"❌ Ошибка обработки клиента: {e}")
         finally:
             client_socket.close()
+            with self.activity_lock:
+                self.active_requests -= 1
+                self.last_activity = time.monotonic()
     
     def handle_get(self, client_socket, path):
         """Обработка GET запроса"""
@@ -193,7 +268,7 @@ def signal_handler(signum, frame):
 
 def parse_simple_args():
     """Простейший парсер аргументов"""
-    global HOST, PORT
+    global HOST, PORT, IDLE_TIMEOUT
     
     for i, arg in enumerate(sys.argv):
         if arg == '-p' and i + 1 < len(sys.argv):
@@ -204,10 +279,17 @@ def parse_simple_args():
                 sys.exit(1)
         elif arg == '-H' and i + 1 < len(sys.argv):
             HOST = sys.argv[i + 1]
+        elif arg == '--idle-timeout' and i + 1 < len(sys.argv):
+            try:
+                IDLE_TIMEOUT = int(sys.argv[i + 1])
+            except ValueError:
+                print("❌ Неверный таймаут простоя!")
+                sys.exit(1)
         elif arg in ['-h', '--help']:
-            print("Использование: python3 server-minimal.py [-p PORT] [-H HOST]")
-            print("  -p     Порт (по умолчанию: 8080)")
-            print("  -H     IP адрес (по умолчанию: 0.0.0.0)")
+            print("Использование: python3 server-minimal.py [-p PORT] [-H HOST] [--idle-timeout SEC]")
+            print("  -p              Порт (по умолчанию: 8080)")
+            print("  -H              IP адрес (по умолчанию: 0.0.0.0)")
+            print("  --idle-timeout  Завершить после SEC секунд без запросов (по умолчанию: 0 - не завершать)")
             sys.exit(0)
 
 def main():
@@ -216,6 +298,9 @@ def main():
     # Простой парсинг аргументов
     parse_simple_args()
     
+    # Работаем из папки сервера: inetd и systemd запускают его из /
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    
     # Проверяем файл
     if not os.path.exists('index.html'):
         print("❌ Файл index.html не найден!")
@@ -225,8 +310,8 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    # Создаем и запускаем сервер
-    server = MinimalHTTPServer(HOST, PORT)
+    # Создаем и запускаем сервер (при сокет-активации - на переданном сокете)
+    server = MinimalHTTPServer(HOST, PORT, get_inherited_socket(), IDLE_TIMEOUT)
     
     try:
         server.start()
@@ -6,14 +6,20 @@
 
 import http.server
 import socketserver
+import socket
 import os
 import sys
 import argparse
 import signal
 import threading
 import time
-from urllib.parse import unquote
-import json
+
+# Первый дескриптор, который передает systemd при сокет-активации
+SD_LISTEN_FDS_START = 3
+
+# Таймаут подключения в режиме завершения по простою: зависший клиент
+# не должен держать сервер в памяти
+REQUEST_TIMEOUT = 30
 
 class MenuHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Кастомный обработчик для сервера меню"""
@@ -54,6 +60,40 @@ class ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     """Многопоточный TCP сервер для обработки нескольких подключений"""
     allow_reuse_address = True
     daemon_threads = True
+    
+    def __init__(self, *args, **kwargs):
+        self.active_requests = 0
+        self.last_activity = time.monotonic()
+        self.activity_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+    
+    def process_request(self, request, client_address):
+        """Учет запросов в обработке для режима завершения по простою"""
+        with self.activity_lock:
+            self.active_requests += 1
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self.request_done()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.request_done()
+    
+    def request_done(self):
+        with self.activity_lock:
+            self.active_requests -= 1
+            self.last_activity = time.monotonic()
+    
+    def idle_time(self):
+        """Сколько секунд сервер простаивает (0, если есть запросы в обработке)"""
+        with self.activity_lock:
+            if self.active_requests:
+                return 0
+            return time.monotonic() - self.last_activity
 
 def signal_handler(signum, frame):
     """Обработчик сигналов для корректного завершения"""
@@ -74,9 +114,51 @@ def check_memory_usage():
     except:
         pass  # Не критично, если не удается получить информацию
 
+def is_listening_socket(fd):
+    """Проверка, что дескриптор - слушающий сокет"""
+    try:
+        sock = socket.socket(fileno=fd)
+    except OSError:
+        return False
+    try:
+        return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN) == 1
+    except OSError:
+        return False
+    finally:
+        sock.detach()
+
+def get_inherited_socket():
+    """Получение сокета от супервизора (systemd LISTEN_FDS или inetd через stdin)"""
+    if (os.environ.get('LISTEN_PID') == str(os.getpid())
+            and os.environ.get('LISTEN_FDS', '0') != '0'):
+        fd = SD_LISTEN_FDS_START
+    elif is_listening_socket(0):
+        fd = 0
+        # inetd подставляет тот же сокет в stdout/stderr - писать туда нельзя
+        if is_listening_socket(1):
+            sys.stdout = sys.stderr = open(os.devnull, 'w')
+    else:
+        return None
+    
+    # Не передаем переменные активации дочерним процессам
+    for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+        os.environ.pop(name, None)
+    return socket.socket(fileno=fd)
+
+def create_server(host, port, inherited_socket=None):
+    """Создание сервера на своем или унаследованном сокете"""
+    if inherited_socket is None:
+        return ThreadedTCPServer((host, port), MenuHTTPRequestHandler)
+    
+    httpd = ThreadedTCPServer((host, port), MenuHTTPRequestHandler,
+                              bind_and_activate=False)
+    httpd.socket.close()
+    httpd.socket = inherited_socket
+    httpd.server_address = inherited_socket.getsockname()
+    return httpd
+
 def get_local_ip():
     """Получение локального IP адреса"""
-    import socket
     try:
         # Подключаемся к удаленному адресу для определения локального IP
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -95,9 +177,15 @@ def main():
                        help='IP адрес для привязки (по умолчанию: 0.0.0.0)')
     parser.add_argument('--monitor', action='store_true',
                        help='Включить мониторинг памяти')
+    parser.add_argument('--idle-timeout', type=int, default=0,
+                       help='Завершить работу после N секунд без запросов '
+                            '(по умолчанию: 0 - не завершать)')
     
     args = parser.parse_args()
     
+    # Работаем из папки сервера: inetd и systemd запускают его из /
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    
     # Проверяем наличие файла index.html
     if not os.path.exists('index.html'):
         print("❌ Файл index.html не найден!")
@@ -109,16 +197,22 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     try:
-        # Создаем сервер
-        with ThreadedTCPServer((args.host, args.port), MenuHTTPRequestHandler) as httpd:
-            local_ip = get_local_ip()
+        # Создаем сервер (при сокет-активации - на переданном сокете)
+        inherited_socket = get_inherited_socket()
+        with create_server(args.host, args.port, inherited_socket) as httpd:
+            host, port = httpd.server_address[:2]
             
-            print("🍽️  Сервер домашнего меню запущен!")
-            print(f"📍 Локальный адрес: http://{local_ip}:{args.port}")
-            print(f"🌐 Сетевой адрес: http://{args.host}:{args.port}")
-            print("⚡ Оптимизировано для роутеров")
-            print("🔄 Нажмите Ctrl+C для остановки")
-            print("-" * 50)
+            if inherited_socket is not None:
+                print(f"🍽️  Сервер домашнего меню активирован на {host}:{port}")
+            else:
+                local_ip = get_local_ip()
+                
+                print("🍽️  Сервер домашнего меню запущен!")
+                print(f"📍 Локальный адрес: http://{local_ip}:{port}")
+                print(f"🌐 Сетевой адрес: http://{host}:{port}")
+                print("⚡ Оптимизировано для роутеров")
+                print("🔄 Нажмите Ctrl+C для остановки")
+                print("-" * 50)
             
             # Запускаем мониторинг памяти в отдельном потоке
             if args.monitor:
@@ -130,9 +224,26 @@ def main():
                 monitor_thread = threading.Thread(target=memory_monitor, daemon=True)
                 monitor_thread.start()
             
+            # Завершаем работу после простоя, супервизор перезапустит по подключению
+            if args.idle_timeout > 0:
+                MenuHTTPRequestHandler.timeout = REQUEST_TIMEOUT
+                
+                def idle_monitor():
+                    while httpd.idle_time() < args.idle_timeout:
+                        time.sleep(1)
+                    httpd.shutdown()
+                
+                idle_thread = threading.Thread(target=idle_monitor, daemon=True)
+                idle_thread.start()
+            
             # Запускаем сервер
             httpd.serve_forever()
             
+            # Дожидаемся запросов, принятых до остановки
+            while httpd.active_requests:
+                time.sleep(0.1)
+            print(f"💤 Нет запросов {args.idle_timeout} сек., сервер завершает работу")
+            
     except OSError as e:
         if e.errno == 98:  # Address already in use
             print(f"❌ Порт {args.port} уже используется!")
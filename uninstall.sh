@@ -7,6 +7,7 @@ set -e
 # Конфигурация
 SERVICE_NAME="home-menu"
 INSTALL_DIR="/opt/home-menu"
+INETD_CONF="/etc/inetd.conf"
 
 # Цвета для вывода
 RED='\033[0;31m'
@@ -51,6 +52,15 @@ confirm_removal() {
 stop_service() {
     print_info "Остановка сервиса..."
     
+    # Systemd (сокет-активация)
+    if command -v systemctl &> /dev/null && \
+       { systemctl is-enabled --quiet ${SERVICE_NAME}.socket 2>/dev/null || \
+         systemctl is-active --quiet ${SERVICE_NAME}.socket 2>/dev/null; }; then
+        sudo systemctl stop ${SERVICE_NAME}.socket
+        sudo systemctl disable ${SERVICE_NAME}.socket 2>/dev/null || true
+        print_success "Сокет сервиса остановлен (systemd)"
+    fi
+    
     # Systemd
     if command -v systemctl &> /dev/null && systemctl is-active --quiet ${SERVICE_NAME} 2>/dev/null; then
         sudo systemctl stop ${SERVICE_NAME}
@@ -75,6 +85,7 @@ remove_service_files() {
     # Systemd
     if [ -f /etc/systemd/system/${SERVICE_NAME}.service ]; then
         sudo rm /etc/systemd/system/${SERVICE_NAME}.service
+        sudo rm -f /etc/systemd/system/${SERVICE_NAME}.socket
         sudo systemctl daemon-reload
         print_success "Удален systemd сервис"
     fi
@@ -84,6 +95,17 @@ remove_service_files() {
         sudo rm /etc/init.d/${SERVICE_NAME}
         print_success "Удален init.d скрипт"
     fi
+    
+    # inetd
+    if grep -q "$INSTALL_DIR/server.py" "$INETD_CONF" 2>/dev/null; then
+        sudo sed -i "\#$INSTALL_DIR/server.py#d" "$INETD_CONF"
+        if [ -x /etc/init.d/inetd ]; then
+            sudo /etc/init.d/inetd restart 2>/dev/null || true
+        else
+            sudo killall -HUP inetd 2>/dev/null || true
+        fi
+        print_success "Удалена запись inetd"
+    fi
 }
 
 remove_application_files() {
@@ -160,7 +182,8 @@ check_removal_success() {
     fi
     
     # Проверяем сервисы
-    if [ -f /etc/systemd/system/${SERVICE_NAME}.service ] || [ -f /etc/init.d/${SERVICE_NAME} ]; then
+    if [ -f /etc/systemd/system/${SERVICE_NAME}.service ] || [ -f /etc/init.d/${SERVICE_NAME} ] || \
+       grep -q "$INSTALL_DIR/server.py" "$INETD_CONF" 2>/dev/null; then
         print_warning "Файлы сервиса все еще существуют"
         ((issues++))
     fi